@@ -1,18 +1,38 @@
 # api/signs/main.py
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel
-from typing import Dict, List, Optional
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import JSONResponse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+import gzip
+import hashlib
+import orjson
+
+try:
+    import ormsgpack
+except ImportError:  # optional; only enables MessagePack listings
+    ormsgpack = None
+
+try:
+    import brotli
+except ImportError:  # optional; listings still come gzip-compressed
+    brotli = None
 
 app = FastAPI(title="ASL Signs API", version="1.0.0")
 
 # ---------- Data Models ----------
-class Pose(BaseModel):
+# Read-only catalog records; orjson and ormsgpack encode dataclasses natively.
+@dataclass(frozen=True, slots=True)
+class Pose:
     handshape: str          # e.g., "fist", "flat-hand", "c-shape"
     orientation: str        # e.g., "palm-out", "palm-in", "palm-left", "palm-right", "thumb-up"
     location: str           # e.g., "neutral-space", "chin", "mouth", "forehead"
     motion: str = "none"    # e.g., "none", "trace-j", "trace-z", "tap", "twist"
 
-class Sign(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Sign:
     key: str                # "A", "B", ..., "Z"
     name: str               # same as key for letters
     poses: List[Pose]       # one or more poses (J and Z are multi-step)
@@ -94,7 +114,7 @@ SIGNS: Dict[str, Sign] = {
     # O: Touch fingertips to thumb making an 'O'
     "O": Sign(key="O", name="O", poses=[
         Pose(handshape="o-shape", orientation="palm-out", location="neutral-space", motion="none")
-    ], notes="palm left, make an "O" shape."),
+    ], notes='palm left, make an "O" shape.'),
 
     # P: Like 'K' but palm down (tilted)
     "P": Sign(key="P", name="P", poses=[
@@ -152,46 +172,207 @@ SIGNS: Dict[str, Sign] = {
     ], notes="use your pointer finger to trace out a Z in the air.")
 }
 
+# Keep the catalog in key order so listings never need sorting.
+SIGNS = dict(sorted(SIGNS.items()))
+
 # ---------- Helpers ----------
+# (sign, lower-cased key/name/notes) pairs, presorted by key. The fields are
+# joined with NUL so a query can never match across two of them.
+_SIGN_INDEX: List[Tuple[Sign, str]] = [
+    (s, f"{s.key}\x00{s.name}\x00{s.notes or ''}".lower())
+    for s in SIGNS.values()
+]
+
+# All haystacks joined into one string, so a search is a few str.find calls
+# in C instead of a Python-level test per entry. Entry i starts at
+# _SIGN_OFFSETS[i] in _SIGN_CORPUS.
+_SIGN_CORPUS: str = "\x00".join(haystack for _, haystack in _SIGN_INDEX)
+_SIGN_OFFSETS: List[int] = list(accumulate((len(h) + 1 for _, h in _SIGN_INDEX), initial=0))
+
 def filter_signs(q: Optional[str]) -> List[Sign]:
+    """Return the signs whose key, name or notes contain q, ordered by key."""
     if not q:
-        return list(SIGNS.values())
+        return [s for s, _ in _SIGN_INDEX]
     ql = q.lower()
+    if "\x00" in ql:
+        return []
     out: List[Sign] = []
-    for s in SIGNS.values():
-        if (
-            ql in s.key.lower() or
-            ql in s.name.lower() or
-            (s.notes and ql in s.notes.lower())
-        ):
-            out.append(s)
+    i = _SIGN_CORPUS.find(ql)
+    while i != -1:
+        n = bisect_right(_SIGN_OFFSETS, i) - 1
+        out.append(_SIGN_INDEX[n][0])
+        # Resume at the next entry; each entry is reported at most once.
+        i = _SIGN_CORPUS.find(ql, _SIGN_OFFSETS[n + 1])
     return out
 
+# ---------- Serialized Responses ----------
+class RawResponse(JSONResponse):
+    """Response whose content is already-encoded bytes; JSON unless told otherwise."""
+    media_type = "application/json"
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+def _etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha1(body).hexdigest()
+
+def _conditional(
+    request: Request,
+    body: bytes,
+    etag: str,
+    media_type: str = RawResponse.media_type,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Answer 304 when If-None-Match carries etag, else send body tagged with it."""
+    headers = {"etag": etag, **(headers or {})}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison (RFC 9110 13.1.2): proxies that re-encode a body
+        # often weaken the tag to W/"...", which must still match.
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers=headers)
+    return RawResponse(body, media_type=media_type, headers=headers)
+
+def _tagged(content) -> Tuple[bytes, str]:
+    body = orjson.dumps(content)
+    return body, _etag(body)
+
+# The catalog never changes at runtime, so every body is encoded once.
+_MSGPACK = "application/msgpack"
+_LIST_VARY = "accept, accept-encoding" if ormsgpack is not None else "accept-encoding"
+
+# (body, etag, extra headers) for one ready-to-send rendering of a listing.
+_Variant = Tuple[bytes, str, Dict[str, str]]
+
+def _compressed(body: bytes) -> Dict[str, _Variant]:
+    """Return body under every content-coding we serve, keyed by coding name."""
+    variants = {"identity": (body, _etag(body), {"vary": _LIST_VARY})}
+    codings = {"gzip": gzip.compress(body, 9, mtime=0)}
+    if brotli is not None:
+        codings["br"] = brotli.compress(body, quality=11)
+    for coding, data in codings.items():
+        variants[coding] = (data, _etag(data), {"vary": _LIST_VARY, "content-encoding": coding})
+    return variants
+
+def _qvalues(header: str) -> Dict[str, float]:
+    """Map each token of an Accept-style header to its q-value (1 when absent).
+
+    A malformed or out-of-range q counts as 0, i.e. as a refusal.
+    """
+    prefs: Dict[str, float] = {}
+    for item in header.split(","):
+        token, *params = (part.strip() for part in item.split(";"))
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+                if not 0.0 <= q <= 1.0:
+                    q = 0.0
+        prefs.setdefault(token.lower(), q)
+    return prefs
+
+def _pick_coding(accept_encoding: str, available: Dict[str, _Variant]) -> str:
+    """Highest-q coding we have, br before gzip on ties; identity if none is wanted."""
+    prefs = _qvalues(accept_encoding)
+    unlisted = prefs.get("*", 0.0)
+    best = max((c for c in ("br", "gzip") if c in available), key=lambda c: prefs.get(c, unlisted), default=None)
+    if best is None:
+        return "identity"
+    q = prefs.get(best, unlisted)
+    if q <= 0.0 or q < prefs.get("identity", 0.0):
+        return "identity"
+    return best
+
+def _media_q(prefs: Dict[str, float], media_type: str) -> float:
+    """q for media_type, falling back to its type/* and then */* entries."""
+    for token in (media_type, media_type.split("/")[0] + "/*", "*/*"):
+        if token in prefs:
+            return prefs[token]
+    return 0.0
+
+def _wants_msgpack(accept: str) -> bool:
+    """MessagePack must be named explicitly, so */* clients keep getting JSON."""
+    prefs = _qvalues(accept)
+    q = prefs.get(_MSGPACK, 0.0)
+    return q > 0.0 and q >= _media_q(prefs, RawResponse.media_type)
+
+def _negotiate(request: Request, variants: Dict[str, Dict[str, _Variant]]) -> Response:
+    """Pick the media type from Accept and the coding from Accept-Encoding."""
+    media_type = RawResponse.media_type
+    if _MSGPACK in variants and _wants_msgpack(request.headers.get("accept", "")):
+        media_type = _MSGPACK
+    by_coding = variants[media_type]
+    coding = _pick_coding(request.headers.get("accept-encoding", ""), by_coding)
+    body, etag, headers = by_coding[coding]
+    return _conditional(request, body, etag, media_type, headers)
+
+# The full listing as JSON, plus MessagePack when ormsgpack is installed, each
+# pre-compressed so gzip/br cost nothing per request.
+_all_signs = [s for s, _ in _SIGN_INDEX]
+_ALL_SIGNS: Dict[str, Dict[str, _Variant]] = {RawResponse.media_type: _compressed(orjson.dumps(_all_signs))}
+if ormsgpack is not None:
+    _ALL_SIGNS[_MSGPACK] = _compressed(ormsgpack.packb(_all_signs))
+del _all_signs
+
+# Per-item (body, etag) pairs, keyed by the upper-cased sign key used in lookups.
+_SIGN_BODIES: Dict[str, Tuple[bytes, str]] = {k: _tagged(s) for k, s in SIGNS.items()}
+_SIGN_POSES_BODIES: Dict[str, Tuple[bytes, str]] = {k: _tagged(s.poses) for k, s in SIGNS.items()}
+
+# Filtered listings depend only on the lower-cased query, so recent ones are
+# kept as (body, etag) pairs. Bodies are spliced from the per-item bytes.
+@lru_cache(maxsize=1024)
+def _search(ql: str) -> Tuple[bytes, str]:
+    body = b"[" + b",".join(_SIGN_BODIES[s.key][0] for s in filter_signs(ql)) + b"]"
+    return body, _etag(body)
+
+# Shared by every miss; responses are never mutated once built. Lookups return
+# it rather than raising HTTPException, so the 404 is declared for OpenAPI here.
+_NOT_FOUND_RESP = RawResponse(orjson.dumps({"detail": "Sign not found"}), status_code=404)
+_NOT_FOUND_DOC = {
+    "description": "Sign not found",
+    "content": {"application/json": {"example": {"detail": "Sign not found"}}},
+}
+
+def _lookup(request: Request, table: Dict[str, Tuple[bytes, str]], key: str) -> Response:
+    # Clients almost always send the upper-case letter, so try it as given
+    # before paying for the upper() copy.
+    entry = table.get(key)
+    if entry is None:
+        entry = table.get(key.upper())
+    if entry is None:
+        return _NOT_FOUND_RESP
+    return _conditional(request, *entry)
+
+_ROOT_RESP = RawResponse(orjson.dumps({"service": "asl-signs", "version": "1.0.0"}))
+_HEALTH_RESP = RawResponse(orjson.dumps({"ok": True}))
+
 # ---------- Endpoints ----------
+# Handlers are async: none of them block, so they run on the event loop, not the threadpool.
 @app.get("/", tags=["meta"])
-def root():
-    return {"service": "asl-signs", "version": "1.0.0"}
+async def root():
+    return _ROOT_RESP
 
 @app.get("/health", tags=["meta"])
-def health():
-    return {"ok": True}
-
-@app.get("/signs", response_model=List[Sign], tags=["signs"])
-def list_signs(q: Optional[str] = Query(None, description="Search by letter/name/notes")):
-    return sorted(filter_signs(q), key=lambda s: s.key)
-
-@app.get("/signs/{letter}", response_model=Sign, tags=["signs"])
-def get_sign(letter: str):
-    L = letter.upper()
-    sign = SIGNS.get(L)
-    if not sign:
-        raise HTTPException(status_code=404, detail=f"Sign '{letter}' not found")
-    return sign
-
-@app.get("/signs/{letter}/pose", response_model=List[Pose], tags=["signs"])
-def get_sign_pose(letter: str):
-    L = letter.upper()
-    sign = SIGNS.get(L)
-    if not sign:
-        raise HTTPException(status_code=404, detail=f"Sign '{letter}' not found")
-    return sign.poses
+async def health():
+    return _HEALTH_RESP
+
+@app.get("/signs", response_class=RawResponse, responses={200: {"model": List[Sign]}}, tags=["signs"])
+async def list_signs(request: Request, q: Optional[str] = Query(None, description="Search by letter/name/notes")):
+    if not q:
+        return _negotiate(request, _ALL_SIGNS)
+    return _conditional(request, *_search(q.lower()))
+
+@app.get("/signs/{letter}", response_class=RawResponse, responses={200: {"model": Sign}, 404: _NOT_FOUND_DOC}, tags=["signs"])
+async def get_sign(request: Request, letter: str):
+    return _lookup(request, _SIGN_BODIES, letter)
+
+@app.get("/signs/{letter}/pose", response_class=RawResponse, responses={200: {"model": List[Pose]}, 404: _NOT_FOUND_DOC}, tags=["signs"])
+async def get_sign_pose(request: Request, letter: str):
+    return _lookup(request, _SIGN_POSES_BODIES, letter)
@@ -1,19 +1,47 @@
 # api/translate/main.py
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
+import asyncio
 import httpx
 import os
 import re
-from functools import lru_cache
-
-app = FastAPI(title="ASL Translate API", version="1.0.0")
+import time
+from contextlib import asynccontextmanager
 
 # Configure where the other APIs live. Defaults assume:
 # - Signs API on :8001
 # - Phrases API on :8002
 SIGNS_BASE_URL = os.getenv("SIGNS_BASE_URL", "http://127.0.0.1:8001")
 PHRASES_BASE_URL = os.getenv("PHRASES_BASE_URL", "http://127.0.0.1:8002")
+# How long (seconds) a downloaded phrase list is reused before it is fetched again
+PHRASES_CACHE_TTL = float(os.getenv("PHRASES_CACHE_TTL", "60"))
+# How long (seconds) to wait before retrying a phrase download that failed
+PHRASES_RETRY_DELAY = float(os.getenv("PHRASES_RETRY_DELAY", "5"))
+# How often (seconds) the other APIs are probed in the background
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "10"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for the whole process so calls to the other APIs
+    # reuse keep-alive connections instead of reconnecting every time.
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0),
+        timeout=3.0,
+    )
+    await refresh_health(app.state.http)
+    health_task = asyncio.create_task(health_loop(app.state.http))
+    try:
+        yield
+    finally:
+        # Let background work unwind before its client is closed underneath it
+        tasks = [t for t in (health_task, _phrase_refresh) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await app.state.http.aclose()
+
+app = FastAPI(title="ASL Translate API", version="1.0.0", lifespan=lifespan)
 
 # ---------------------------
 # Models
@@ -58,25 +86,45 @@ class TranslationResponse(BaseModel):
 _clean_re = re.compile(r"[^a-z0-9\s]+")
 
 def normalize(text: str) -> str:
+    t = text.strip()
+    # Already-clean input (the common case) skips the lower() + sub() copies
+    if t.islower() and t.isascii() and not _clean_re.search(t):
+        return t
     return _clean_re.sub("", text.lower()).strip()
 
-@lru_cache(maxsize=2048)
-def is_phrase_available() -> bool:
+# normalize() leaves only a-z, digits and whitespace; these pick the letters
+# and the (unsupported) digits out of a word in one C-level scan each
+_LETTERS_RE = re.compile(r"[a-z]")
+_DIGITS_RE = re.compile(r"[0-9]")
+
+# Last probe result per service; written only by refresh_health, so request
+# handlers never wait on a probe.
+_health: Dict[str, bool] = {"phrases": False, "signs": False}
+
+async def _probe(client: httpx.AsyncClient, url: str) -> bool:
     try:
-        with httpx.Client(timeout=2.0) as c:
-            r = c.get(f"{PHRASES_BASE_URL}/phrases")
-            return r.status_code == 200
+        r = await client.get(url, timeout=2.0)
+        return r.status_code == 200
     except Exception:
         return False
 
-@lru_cache(maxsize=2048)
+async def refresh_health(client: httpx.AsyncClient) -> None:
+    _health["phrases"], _health["signs"] = await asyncio.gather(
+        _probe(client, f"{PHRASES_BASE_URL}/phrases"),
+        _probe(client, f"{SIGNS_BASE_URL}/signs/A"),
+    )
+
+async def health_loop(client: httpx.AsyncClient) -> None:
+    """Re-probe every HEALTH_CHECK_INTERVAL so outages and recoveries are noticed."""
+    while True:
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+        await refresh_health(client)
+
+def is_phrase_available() -> bool:
+    return _health["phrases"]
+
 def is_signs_available() -> bool:
-    try:
-        with httpx.Client(timeout=2.0) as c:
-            r = c.get(f"{SIGNS_BASE_URL}/signs/A")
-            return r.status_code == 200
-    except Exception:
-        return False
+    return _health["signs"]
 
 # Tiny local fallback so demos work without the other services running
 LOCAL_PHRASES: Dict[str, Phrase] = {
@@ -113,6 +161,23 @@ LOCAL_PHRASES: Dict[str, Phrase] = {
     ),
 }
 
+# Known phrases as a word trie: each node maps a word to the next node, and
+# _PHRASE_END holds the Phrase completed at that node. Normalized words are
+# never empty, so "" cannot clash with a real word.
+_PHRASE_END = ""
+
+def build_phrase_trie(phrases: Dict[str, Phrase]) -> Dict[str, Any]:
+    """Build a word trie from phrases keyed by normalized name."""
+    root: Dict[str, Any] = {}
+    for name, phrase in phrases.items():
+        node = root
+        for word in name.split():
+            node = node.setdefault(word, {})
+        node[_PHRASE_END] = phrase
+    return root
+
+LOCAL_PHRASE_TRIE = build_phrase_trie(LOCAL_PHRASES)
+
 # Minimal fallback letter shapes for a few letters (you can expand or rely on Signs API)
 LOCAL_SIGNS: Dict[str, LetterShape] = {
     "a": LetterShape(letter="A", handshape="fist", orientation="palm-out", location="neutral-space", motion="none"),
@@ -126,41 +191,84 @@ LOCAL_SIGNS: Dict[str, LetterShape] = {
 # ---------------------------
 # Remote fetchers
 # ---------------------------
-def fetch_phrase_by_best_match(norm_text: str) -> Optional[Phrase]:
+_phrase_trie: Dict[str, Any] = LOCAL_PHRASE_TRIE
+_phrase_cache_expiry: float = 0.0
+# The download in flight, if any. Concurrent requests share it, and with it
+# its outcome, instead of each starting (and queueing behind) their own.
+_phrase_refresh: Optional["asyncio.Task[Dict[str, Any]]"] = None
+
+async def _refresh_phrases(client: httpx.AsyncClient) -> Dict[str, Any]:
+    global _phrase_trie, _phrase_cache_expiry
+    try:
+        r = await client.get(f"{PHRASES_BASE_URL}/phrases")
+        r.raise_for_status()
+        by_name: Dict[str, Phrase] = {}
+        for data in r.json():
+            p = Phrase(**data)
+            by_name.setdefault(normalize(p.name), p)  # first listed wins, as the old scan did
+    except Exception:
+        # Keep serving the trie we have until the retry delay has passed
+        _phrase_cache_expiry = time.monotonic() + PHRASES_RETRY_DELAY
+        raise
+    _phrase_trie = build_phrase_trie({**LOCAL_PHRASES, **by_name})
+    _phrase_cache_expiry = time.monotonic() + PHRASES_CACHE_TTL
+    return _phrase_trie
+
+def _refresh_done(task: "asyncio.Task[Dict[str, Any]]") -> None:
+    global _phrase_refresh
+    _phrase_refresh = None
+    if not task.cancelled():
+        task.exception()  # retrieved here, so an unawaited failure is not logged
+
+async def fetch_phrases(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """
+    Return the word trie of the Phrases API catalog plus LOCAL_PHRASES,
+    downloading the catalog at most once per PHRASES_CACHE_TTL.
+
+    Once a catalog has been downloaded, an expired trie keeps being served
+    while its replacement downloads in the background. Until then, callers
+    wait on the one shared download.
+    """
+    global _phrase_refresh
+    if time.monotonic() < _phrase_cache_expiry:
+        return _phrase_trie
+    if _phrase_refresh is None:
+        _phrase_refresh = asyncio.create_task(_refresh_phrases(client))
+        _phrase_refresh.add_done_callback(_refresh_done)
+    if _phrase_trie is not LOCAL_PHRASE_TRIE:
+        return _phrase_trie
+    # shield: one caller going away must not cancel the download for the rest
+    return await asyncio.shield(_phrase_refresh)
+
+async def fetch_phrase_trie(client: httpx.AsyncClient) -> Dict[str, Any]:
     """
-    Try exact match first (e.g., 'how are you'),
-    else search the list for a phrase whose name equals the normalized text.
+    Return the word trie of every known phrase: the Phrases API catalog
+    plus LOCAL_PHRASES, or LOCAL_PHRASES alone when the API is unreachable.
     """
     if is_phrase_available():
         try:
-            with httpx.Client(timeout=3.0) as c:
-                # Pull all phrases and try a name match client-side (keeps API simple)
-                r = c.get(f"{PHRASES_BASE_URL}/phrases")
-                r.raise_for_status()
-                phrases = [Phrase(**p) for p in r.json()]
-                for p in phrases:
-                    if normalize(p.name) == norm_text:
-                        return p
+            # Pull all phrases and match client-side (keeps API simple)
+            return await fetch_phrases(client)
         except Exception:
             pass
     # fallback
-    return LOCAL_PHRASES.get(norm_text)
+    return LOCAL_PHRASE_TRIE
 
-def fetch_sign(letter: str) -> Optional[LetterShape]:
+async def fetch_sign(letter: str, client: httpx.AsyncClient) -> Optional[LetterShape]:
     key = letter.upper()
     if is_signs_available():
         try:
-            with httpx.Client(timeout=2.0) as c:
-                r = c.get(f"{SIGNS_BASE_URL}/signs/{key}")
-                if r.status_code == 200:
-                    data = r.json()
-                    return LetterShape(
-                        letter=key,
-                        handshape=data["handshape"],
-                        orientation=data["orientation"],
-                        location=data["location"],
-                        motion=data.get("motion", "none"),
-                    )
+            r = await client.get(f"{SIGNS_BASE_URL}/signs/{key}", timeout=2.0)
+            if r.status_code == 200:
+                # The Signs API returns a Sign; letters are signed from its first pose
+                pose = r.json()["poses"][0]
+                return LetterShape(
+                    letter=key,
+                    handshape=pose["handshape"],
+                    orientation=pose["orientation"],
+                    location=pose["location"],
+                    motion=pose.get("motion", "none"),
+                )
         except Exception:
             pass
     # fallback
@@ -176,35 +284,60 @@ def build_action_from_letter(ls: LetterShape) -> Action:
     step = Step(handshape=ls.handshape, orientation=ls.orientation, location=ls.location, motion=ls.motion)
     return Action(type="letter", label=ls.letter, steps=[step])
 
-def translate_text_to_actions(text: str) -> TranslationResponse:
+def split_phrases(words: List[str], trie: Dict[str, Any]) -> List[Union[Phrase, str]]:
+    """
+    Walk words left to right, taking the longest known phrase that starts
+    at each position; words not covered by any phrase are returned as-is.
+    """
+    out: List[Union[Phrase, str]] = []
+    i = 0
+    while i < len(words):
+        node, match, end = trie, None, i
+        for j in range(i, len(words)):
+            node = node.get(words[j])
+            if node is None:
+                break
+            if _PHRASE_END in node:
+                match, end = node[_PHRASE_END], j + 1
+        if match is None:
+            out.append(words[i])
+            i += 1
+        else:
+            out.append(match)
+            i = end
+    return out
+
+async def translate_text_to_actions(text: str, client: httpx.AsyncClient) -> TranslationResponse:
     warnings: List[str] = []
     norm = normalize(text)
 
-    # 1) Try to match a complete phrase
-    phrase = fetch_phrase_by_best_match(norm)
-    if phrase:
-        return TranslationResponse(
-            normalized_text=norm,
-            path=[build_action_from_phrase(phrase)],
-            source="phrases",
-            warnings=warnings
-        )
-
-    # 2) Spell it letter-by-letter (skip spaces)
+    # 1) Match known phrases, longest first, anywhere in the text
+    segments = split_phrases(norm.split(), await fetch_phrase_trie(client))
+
+    # 2) Spell the remaining words letter-by-letter, fetching each distinct
+    # letter once and all of them concurrently
+    spelled = [seg for seg in segments if isinstance(seg, str)]
+    letters = sorted(set(_LETTERS_RE.findall(" ".join(spelled))))
+    shapes = dict(zip(letters, await asyncio.gather(*(fetch_sign(ch, client) for ch in letters))))
+    # One Action per distinct letter, reused for every occurrence
+    letter_actions = {ch: build_action_from_letter(sign) for ch, sign in shapes.items() if sign}
+
     actions: List[Action] = []
     missing_letters: List[str] = []
-    for ch in norm:
-        if ch == " ":
+    phrase_count = 0
+    for seg in segments:
+        if isinstance(seg, Phrase):
+            actions.append(build_action_from_phrase(seg))
+            phrase_count += 1
             continue
-        if not ch.isalpha():
-            # We only handle letters here; numerals/punct could be extended later
-            warnings.append(f"Character '{ch}' not supported; skipped.")
-            continue
-        sign = fetch_sign(ch)
-        if sign:
-            actions.append(build_action_from_letter(sign))
-        else:
-            missing_letters.append(ch)
+        # We only handle letters here; numerals could be extended later
+        warnings.extend(f"Character '{d}' not supported; skipped." for d in _DIGITS_RE.findall(seg))
+        for ch in _LETTERS_RE.findall(seg):
+            action = letter_actions.get(ch)
+            if action:
+                actions.append(action)
+            else:
+                missing_letters.append(ch)
 
     if not actions:
         raise HTTPException(status_code=422, detail="Could not translate input (no phrases matched and no letters available).")
@@ -212,10 +345,14 @@ def translate_text_to_actions(text: str) -> TranslationResponse:
     if missing_letters:
         warnings.append(f"No sign data for: {', '.join(sorted(set(missing_letters)))} (consider expanding the Signs API).")
 
+    if phrase_count == len(actions):
+        source = "phrases"
+    else:
+        source = "mixed" if phrase_count else "spelling"
     return TranslationResponse(
         normalized_text=norm,
         path=actions,
-        source="spelling",
+        source=source,
         warnings=warnings
     )
 
@@ -223,11 +360,11 @@ def translate_text_to_actions(text: str) -> TranslationResponse:
 # Endpoints
 # ---------------------------
 @app.get("/", tags=["meta"])
-def root():
+async def root():
     return {"service": "asl-translate", "version": "1.0.0"}
 
 @app.get("/health", tags=["meta"])
-def health():
+async def health():
     return {
         "ok": True,
         "phrases_api": is_phrase_available(),
@@ -235,11 +372,11 @@ def health():
     }
 
 @app.get("/translate", response_model=TranslationResponse, tags=["translate"])
-def translate_get(text: str = Query(..., min_length=1, description="Plain text to translate into ASL actions")):
-    return translate_text_to_actions(text)
+async def translate_get(request: Request, text: str = Query(..., min_length=1, description="Plain text to translate into ASL actions")):
+    return await translate_text_to_actions(text, request.app.state.http)
 
 @app.post("/translate", response_model=TranslationResponse, tags=["translate"])
-def translate_post(req: TranslationRequest):
+async def translate_post(request: Request, req: TranslationRequest):
     if not req.text or not req.text.strip():
         raise HTTPException(status_code=400, detail="Text is required")
-    return translate_text_to_actions(req.text)
+    return await translate_text_to_actions(req.text, request.app.state.http)
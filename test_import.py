@@ -0,0 +1,32 @@
+# test_import.py
+# Imports each API module from its file so a SyntaxError (or any other
+# import-time failure) in the catalogs fails CI instead of a deploy.
+import importlib.util
+import pathlib
+import unittest
+
+ROOT = pathlib.Path(__file__).resolve().parent
+
+
+def load(service: str):
+    # Every service lives in a module called main, so give each a unique name.
+    spec = importlib.util.spec_from_file_location(f"{service}_main", ROOT / "api" / service / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class ImportTest(unittest.TestCase):
+    def test_phrases(self):
+        module = load("phrases")
+        self.assertTrue(module.PHRASES)
+        self.assertIsNotNone(module.app)
+
+    def test_signs(self):
+        module = load("signs")
+        self.assertTrue(module.SIGNS)
+        self.assertIsNotNone(module.app)
+
+
+if __name__ == "__main__":
+    unittest.main()
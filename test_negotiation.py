@@ -0,0 +1,47 @@
+# test_negotiation.py
+# Content negotiation and conditional requests on the listing endpoints.
+# phrases and signs each carry their own copy of this header handling, so
+# every case runs against both apps to keep the copies in step.
+import unittest
+
+from fastapi.testclient import TestClient
+
+from test_import import load
+
+APPS = {service: TestClient(load(service).app) for service in ("phrases", "signs")}
+
+
+class NegotiationTest(unittest.TestCase):
+    def get(self, service, **headers):
+        return APPS[service].get(f"/{service}", headers={k.replace("_", "-"): v for k, v in headers.items()})
+
+    def test_refused_codings_are_not_served(self):
+        for service in APPS:
+            with self.subTest(service=service):
+                r = self.get(service, accept_encoding="br;q=0, gzip;q=0, identity")
+                self.assertEqual(r.status_code, 200)
+                self.assertNotIn("content-encoding", r.headers)
+
+    def test_wildcard_coding_skips_refused_br(self):
+        for service in APPS:
+            with self.subTest(service=service):
+                r = self.get(service, accept_encoding="*;q=0.3, br;q=0")
+                self.assertEqual(r.headers.get("content-encoding"), "gzip")
+
+    def test_refused_msgpack_gets_json(self):
+        for service in APPS:
+            with self.subTest(service=service):
+                r = self.get(service, accept="application/json, application/msgpack;q=0", accept_encoding="identity")
+                self.assertEqual(r.headers["content-type"], "application/json")
+
+    def test_if_none_match_weak_and_wildcard(self):
+        for service in APPS:
+            etag = self.get(service, accept_encoding="identity").headers["etag"]
+            for tag in (etag, f"W/{etag}", "*"):
+                with self.subTest(service=service, if_none_match=tag):
+                    r = self.get(service, accept_encoding="identity", if_none_match=tag)
+                    self.assertEqual(r.status_code, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()